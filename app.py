@@ -13,6 +13,7 @@ from groq import Groq
 from prompts import SYSTEM_PROMPT, WELCOME_MESSAGE, ERROR_RESPONSE
 from data_utils import (
     load_data,
+    build_time_index,
     get_dataset_summary,
     execute_pandas_code,
     format_currency_columns,
@@ -102,6 +103,7 @@ with st.sidebar:
         & df["region"].isin(sel_regions)
         & df["category"].isin(sel_categories)
     ]
+    ts_index = build_time_index(df_filtered, (tuple(sel_years), tuple(sel_regions), tuple(sel_categories)))
     st.caption(f"Filtered: **{len(df_filtered):,}** records")
 
     st.divider()
@@ -296,7 +298,7 @@ if user_input:
             pandas_code = llm_response.get("pandas_code", "df_result = df.head(10)")
 
             # Execute against filtered dataframe
-            result_df, error = execute_pandas_code(pandas_code, df_filtered)
+            result_df, error = execute_pandas_code(pandas_code, df_filtered, ts_index)
 
             if error:
                 st.warning(f"⚠️ Code execution error: {error}\n\nShowing sample data instead.")
@@ -4,8 +4,11 @@ Data utility functions for the OLAP Streamlit App
 
 import pandas as pd
 import streamlit as st
+import copy
 import os
 
+from time_series import TimeSeriesIndex
+
 
 @st.cache_data
 def load_data() -> pd.DataFrame:
@@ -15,6 +18,15 @@ def load_data() -> pd.DataFrame:
     return df
 
 
+@st.cache_resource(max_entries=8)
+def build_time_index(_df: pd.DataFrame, filter_key: tuple) -> TimeSeriesIndex:
+    """
+    Build and cache the time-series index for a filtered dataset.
+    `filter_key` identifies the sidebar selection; the frame itself is not hashed.
+    """
+    return TimeSeriesIndex(_df)
+
+
 def get_dataset_summary(df: pd.DataFrame) -> dict:
     """Return a summary of the dataset for the sidebar."""
     return {
@@ -29,12 +41,17 @@ def get_dataset_summary(df: pd.DataFrame) -> dict:
     }
 
 
-def execute_pandas_code(code: str, df: pd.DataFrame):
+def execute_pandas_code(code: str, df: pd.DataFrame, ts_index: TimeSeriesIndex | None = None):
     """
     Safely execute the LLM-generated pandas code.
+    The code sees `df` plus `ts`, the time-series index built from the same rows.
     Returns (df_result, error_message).
     """
-    local_vars = {"df": df.copy(), "pd": pd}
+    if ts_index is None:
+        ts_index = TimeSeriesIndex(df)
+    # The index is shared through st.cache_resource: its arrays and mappings are
+    # read-only, and the shallow copy keeps attribute reassignment local.
+    local_vars = {"df": df.copy(), "pd": pd, "ts": copy.copy(ts_index)}
     try:
         exec(code, {"pd": pd}, local_vars)
         df_result = local_vars.get("df_result", None)
@@ -49,7 +66,12 @@ def execute_pandas_code(code: str, df: pd.DataFrame):
 
 def format_currency_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Format currency-like columns for display."""
-    currency_cols = [c for c in df.columns if c in ("revenue", "cost", "profit", "unit_price")]
+    currency_names = {"revenue", "cost", "profit", "unit_price"}
+    currency_names |= {f"{p}_{m}" for p in ("prior", "running", "rolling") for m in ("revenue", "cost", "profit")}
+    # period_over_period's `change` is money only when the compared measure is
+    if {"prior_revenue", "prior_cost", "prior_profit"} & set(df.columns):
+        currency_names.add("change")
+    currency_cols = [c for c in df.columns if c in currency_names]
     df_display = df.copy()
     for col in currency_cols:
         df_display[col] = df_display[col].apply(lambda x: f"${x:,.2f}" if pd.notna(x) else "")
@@ -85,6 +85,26 @@ Always respond with a JSON object in this exact structure:
 - Sort results logically (by value descending for rankings, by time for trends)
 - For revenue/profit formatting, values are in USD
 
+## Time-Series Helpers
+
+A precomputed time-series index named `ts` is available alongside `df`. Prefer it over groupby/pivot/pct_change for trends, period totals, period-over-period comparisons, running totals and rolling windows:
+
+- `ts.series(measure, freq="M", start=None, end=None, by=None, **filters)` – one row per period, with no gaps
+- `ts.total(measure, start=None, end=None, by=None, **filters)` – exact total between two dates; a number, or a DataFrame when `by` is given
+- `ts.period_over_period(measure, freq="Y", lag=1, start=None, end=None, by=None, **filters)` – adds `prior_<measure>`, `change`, `pct_change`
+- `ts.running_total(measure, freq="M", start=None, end=None, by=None, **filters)` – adds `running_<measure>`
+- `ts.rolling(measure, window=7, freq="D", how="sum"|"mean", start=None, end=None, by=None, **filters)` – adds `rolling_<measure>`
+
+Details:
+- measure: revenue, cost, profit, quantity, transactions, profit_margin
+- freq: "D" (day), "M" (month), "Q" (quarter), "Y" (year)
+- start/end (inclusive): a year like 2024, or "2024Q4", "2024-03", "2024-03-15"
+- by: "region", "category", "customer_segment", or a list of them
+- filters: region=..., category=..., customer_segment=... (a value or a list)
+- Results are DataFrames with a `period` column ("2024", "2024Q1", "2024-01", "2024-01-15") that can be used directly as the chart x-axis
+- For country, subcategory or other columns, fall back to `df`
+- `ts` is built from the same sidebar-filtered rows as `df`: years the user filtered out are omitted (not zero), and priors in them are NaN. Filtering `ts` on a region, category or segment value that is not in the data (misspelled or removed by the sidebar) raises an error listing the available values. Never describe a filtered-out year, region, category or segment as having zero sales
+
 ## Examples
 
 User: "What is total revenue by region?"
@@ -115,6 +135,34 @@ Response:
 }
 ```
 
+User: "Monthly revenue trend for 2024"
+Response:
+```json
+{
+  "operation": "drill_down",
+  "description": "Monthly revenue and profit for 2024",
+  "pandas_code": "df_result = ts.series('revenue', freq='M', start=2024, end=2024).merge(ts.series('profit', freq='M', start=2024, end=2024), on='period')",
+  "chart_type": "line",
+  "chart_config": {"x": "period", "y": "revenue", "color": null, "title": "Monthly Revenue Trend, 2024"},
+  "insight": "The monthly trend shows seasonality and any months where revenue departed from the usual pattern.",
+  "follow_ups": ["Compare 2023 vs 2024 revenue by region", "Show the 3-month rolling average of revenue", "Which quarter had the strongest quarter-over-quarter growth?"]
+}
+```
+
+User: "Compare 2023 vs 2024 revenue by region"
+Response:
+```json
+{
+  "operation": "compare",
+  "description": "Year-over-year revenue change by region, 2024 vs 2023",
+  "pandas_code": "df_result = ts.period_over_period('revenue', freq='Y', start=2024, end=2024, by='region').sort_values('pct_change', ascending=False)",
+  "chart_type": "bar",
+  "chart_config": {"x": "region", "y": "pct_change", "color": null, "title": "Revenue Growth by Region, 2024 vs 2023"},
+  "insight": "Year-over-year growth shows which regions gained or lost momentum between 2023 and 2024.",
+  "follow_ups": ["Which categories drove the change in the weakest region?", "Show quarter-over-quarter growth for 2024", "What is the running total of 2024 revenue by month?"]
+}
+```
+
 Always return valid JSON. Never include explanation text outside the JSON block.
 """
 
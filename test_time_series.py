@@ -0,0 +1,173 @@
+"""
+Tests for the precomputed time-series index, checked against plain pandas groupbys
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from time_series import TimeSeriesIndex
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "global_retail_sales.csv")
+
+
+@pytest.fixture(scope="module")
+def df() -> pd.DataFrame:
+    return pd.read_csv(DATA_PATH, parse_dates=["order_date"])
+
+
+@pytest.fixture(scope="module")
+def ts(df) -> TimeSeriesIndex:
+    return TimeSeriesIndex(df)
+
+
+def _expected(df: pd.DataFrame, freq: str, by: list, measure: str = "revenue") -> pd.DataFrame:
+    period = df["order_date"].dt.to_period(freq).astype(str)
+    return (
+        df.assign(period=period)
+        .groupby(["period", *by])[measure]
+        .sum()
+        .round(2)
+        .reset_index()
+    )
+
+
+@pytest.mark.parametrize("freq", ["M", "Q", "Y"])
+def test_series_by_region_matches_groupby(df, ts, freq):
+    result = ts.series("revenue", freq=freq, by="region")
+    expected = _expected(df, freq, ["region"])
+    pd.testing.assert_frame_equal(result, expected, check_exact=False)
+
+
+def test_series_by_several_dimensions_keeps_by_order(df, ts):
+    result = ts.series("profit", freq="Y", by=["customer_segment", "region"])
+    expected = _expected(df, "Y", ["customer_segment", "region"], "profit")
+    assert list(result.columns) == ["period", "customer_segment", "region", "profit"]
+    pd.testing.assert_frame_equal(result, expected, check_exact=False)
+
+
+def test_series_window_and_filters(df, ts):
+    result = ts.series("quantity", freq="M", start=2024, end="2024Q2", category="Electronics")
+    rows = df[(df["year"] == 2024) & (df["quarter"].isin(["Q1", "Q2"])) & (df["category"] == "Electronics")]
+    assert result["period"].tolist() == [f"2024-0{m}" for m in range(1, 7)]
+    np.testing.assert_allclose(result["quantity"], rows.groupby("month")["quantity"].sum())
+
+
+def test_total_over_date_range(df, ts):
+    rows = df[(df["order_date"] >= "2023-03-05") & (df["order_date"] <= "2023-04-10")]
+    assert ts.total("profit", "2023-03-05", "2023-04-10") == pytest.approx(rows["profit"].sum())
+    by_region = ts.total("profit", "2023-03-05", "2023-04-10", by="region").set_index("region")["profit"]
+    np.testing.assert_allclose(by_region.sort_index(), rows.groupby("region")["profit"].sum(), atol=0.01)
+
+
+def test_year_over_year(df, ts):
+    result = ts.period_over_period("revenue", freq="Y", by="region")
+    yearly = df.groupby(["year", "region"])["revenue"].sum().unstack()
+    assert result.loc[result["period"] == "2022", "prior_revenue"].isna().all()
+    latest = result[result["period"] == "2024"].set_index("region")
+    np.testing.assert_allclose(latest["prior_revenue"], yearly.loc[2023], atol=0.01)
+    np.testing.assert_allclose(
+        latest["pct_change"], ((yearly.loc[2024] - yearly.loc[2023]) / yearly.loc[2023] * 100), atol=0.01
+    )
+
+
+def test_same_quarter_last_year(df, ts):
+    result = ts.period_over_period("revenue", freq="Q", lag=4)
+    quarterly = df.groupby(df["order_date"].dt.to_period("Q"))["revenue"].sum()
+    assert result["prior_revenue"].iloc[:4].isna().all()
+    np.testing.assert_allclose(result["prior_revenue"].iloc[4:], quarterly.iloc[:-4], atol=0.01)
+
+
+def test_running_total_and_rolling(df, ts):
+    monthly = df.groupby(df["order_date"].dt.to_period("M"))["revenue"].sum()
+    running = ts.running_total("revenue", freq="M", start=2023, end=2023)
+    np.testing.assert_allclose(running["running_revenue"], monthly["2023"].cumsum(), atol=0.01)
+
+    daily = df[df["category"] == "Electronics"].set_index("order_date")["revenue"].resample("D").sum()
+    rolled = ts.rolling("revenue", window=7, category="Electronics")
+    np.testing.assert_allclose(rolled["rolling_revenue"], daily.rolling(7, min_periods=1).sum(), atol=0.01)
+
+
+def test_unknown_filter_value_raises(ts):
+    with pytest.raises(ValueError, match="europe"):
+        ts.total("revenue", region="europe")
+    with pytest.raises(ValueError, match="Atlantis"):
+        ts.series("revenue", freq="Y", by="region", region=["Europe", "Atlantis"])
+
+
+def test_filtered_out_region_raises(df):
+    ts = TimeSeriesIndex(df[df["region"] != "Europe"])
+    assert "Europe" not in ts.series("revenue", freq="Y", by="region")["region"].tolist()
+    with pytest.raises(ValueError, match="Europe"):
+        ts.series("revenue", freq="Y", region="Europe")
+    asia = df[df["region"] == "Asia Pacific"]
+    assert ts.total("revenue", region="Asia Pacific") == pytest.approx(asia["revenue"].sum())
+
+
+def test_missing_measure_values_are_skipped(df):
+    with_gap = df.copy()
+    with_gap.loc[with_gap.index[100], "revenue"] = np.nan
+    ts = TimeSeriesIndex(with_gap)
+    assert ts.total("revenue") == pytest.approx(with_gap["revenue"].sum())
+    assert ts.series("revenue", freq="Y")["revenue"].sum() == pytest.approx(with_gap["revenue"].sum())
+
+
+def test_index_state_is_read_only(ts):
+    with pytest.raises(ValueError):
+        ts._prefix["D"]["revenue"][..., 1] = 0
+    with pytest.raises(TypeError):
+        ts._prefix["D"]["revenue"] = None
+    with pytest.raises(TypeError):
+        ts.members["region"] = ("Europe",)
+    with pytest.raises(ValueError):
+        ts.years[0] = 1999
+
+
+def test_unknown_measure_or_dimension_raises(ts):
+    with pytest.raises(ValueError):
+        ts.series("margin")
+    with pytest.raises(ValueError):
+        ts.series("revenue", by="country")
+
+
+def test_empty_frame(df):
+    empty = TimeSeriesIndex(df.iloc[:0])
+    assert empty.series("revenue", freq="Q").empty
+    assert empty.period_over_period("revenue").empty
+    assert empty.rolling("revenue").empty
+    assert np.isnan(empty.total("revenue"))
+
+
+def test_partial_first_quarter_and_year():
+    df = pd.DataFrame(
+        {
+            "order_date": pd.to_datetime(["2022-02-15", "2022-03-01", "2022-11-30", "2023-01-02"]),
+            "region": "Europe",
+            "category": "Furniture",
+            "customer_segment": "Consumer",
+            "revenue": [10.0, 20.0, 30.0, 40.0],
+            "cost": 0.0,
+            "profit": 0.0,
+            "quantity": 1,
+        }
+    )
+    ts = TimeSeriesIndex(df)
+    assert ts.series("revenue", freq="Q").set_index("period")["revenue"].to_dict() == {
+        "2022Q1": 30.0, "2022Q2": 0.0, "2022Q3": 0.0, "2022Q4": 30.0, "2023Q1": 40.0,
+    }
+    assert ts.series("revenue", freq="Y")["revenue"].tolist() == [60.0, 40.0]
+
+
+def test_filtered_out_year_is_omitted(df):
+    ts = TimeSeriesIndex(df[df["year"].isin([2022, 2024])])
+    assert ts.series("revenue", freq="Y")["period"].tolist() == ["2022", "2024"]
+    assert ts.period_over_period("revenue", freq="Y")["prior_revenue"].isna().all()
+    assert np.isnan(ts.total("revenue", start=2023, end=2023))
+
+    # a 3-month window ending January 2024 spans Nov-Dec 2022, not the zeros of 2023
+    monthly = df.groupby(df["order_date"].dt.to_period("M"))["revenue"].sum()
+    rolled = ts.rolling("revenue", window=3, freq="M", start="2024-01", end="2024-01")
+    expected = monthly[["2022-11", "2022-12", "2024-01"]].sum()
+    assert rolled["rolling_revenue"].iloc[0] == pytest.approx(expected, abs=0.01)
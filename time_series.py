@@ -0,0 +1,276 @@
+"""
+Precomputed time-series index for trend, period-over-period and rolling queries
+"""
+
+import datetime
+import itertools
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ("region", "category", "customer_segment")
+MEASURES = ("revenue", "cost", "profit", "quantity", "transactions", "profit_margin")
+FREQUENCIES = ("D", "M", "Q", "Y")
+
+
+def _to_period(value) -> pd.Period:
+    """Interpret a start/end bound: 2024, "2024", "2024Q4", "2024-03" or a date."""
+    if isinstance(value, (int, np.integer)):
+        return pd.Period(year=int(value), freq="Y")
+    if isinstance(value, (pd.Timestamp, datetime.date)):
+        return pd.Period(value, freq="D")
+    return pd.Period(value)
+
+
+class TimeSeriesIndex:
+    """
+    Dense per-day and per-month prefix sums of every additive measure, broken
+    out by region × category × customer_segment.
+
+    A period total is the difference of two prefix sums, so a series of P
+    periods costs O(P) and each rolling window O(1), independent of row count.
+    Quarterly and yearly series are read off the monthly arrays.
+
+    Only years present in `df` are reported: when the sidebar drops a year in
+    the middle of the range, its periods are left out of every result instead
+    of showing up as zeros. Likewise, filtering on a region, category or
+    segment that is not in `df` raises rather than reporting zero sales.
+
+    The index is read-only after construction, so one cached instance can be
+    shared across sessions; hand generated code a `copy.copy()` of it.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        df = df.dropna(subset=["order_date", *DIMENSIONS])
+        self.members = MappingProxyType({dim: tuple(sorted(df[dim].unique().tolist())) for dim in DIMENSIONS})
+        shape = tuple(len(self.members[dim]) for dim in DIMENSIONS)
+
+        dates = df["order_date"].dt.normalize()
+        self.years = np.array(sorted(dates.dt.year.unique()), dtype=np.int64)
+        self.years.setflags(write=False)
+        if df.empty:
+            self.days = pd.PeriodIndex([], freq="D")
+            self.months = pd.PeriodIndex([], freq="M")
+        else:
+            self.days = pd.period_range(dates.min(), dates.max(), freq="D")
+            self.months = pd.period_range(dates.min(), dates.max(), freq="M")
+
+        cell = np.zeros(len(df), dtype=np.int64)
+        for dim in DIMENSIONS:
+            codes = pd.Categorical(df[dim], categories=self.members[dim]).codes
+            cell = cell * len(self.members[dim]) + codes
+        # Running count of days in a loaded year, to tell real zeros from filtered-out years
+        self._loaded_days = np.r_[0, np.cumsum(np.isin(self.days.year, self.years))]
+        self._loaded_days.setflags(write=False)
+
+        positions = {"D": np.zeros(len(df), dtype=np.int64), "M": np.zeros(len(df), dtype=np.int64)}
+        if not df.empty:
+            first = self.days[0].start_time
+            positions["D"] = (dates - first).dt.days.to_numpy(dtype=np.int64)
+            positions["M"] = (
+                (dates.dt.year - first.year) * 12 + dates.dt.month - first.month
+            ).to_numpy(dtype=np.int64)
+
+        # _prefix[base][measure] has shape (regions, categories, segments, periods + 1)
+        prefixes = {"D": {}, "M": {}}
+        for base, n_periods in (("D", len(self.days)), ("M", len(self.months))):
+            flat = cell * n_periods + positions[base]
+            for measure in MEASURES:
+                if measure == "profit_margin":
+                    continue  # ratio of profit to revenue, derived per window
+                if measure == "transactions":
+                    weights = np.ones(len(df))
+                else:
+                    weights = np.nan_to_num(df[measure].to_numpy(dtype=float))  # skip NaN like pandas sum()
+                dense = np.bincount(flat, weights=weights, minlength=int(np.prod(shape)) * n_periods)
+                prefix = np.zeros(shape + (n_periods + 1,))
+                np.cumsum(dense.reshape(shape + (n_periods,)), axis=-1, out=prefix[..., 1:])
+                prefix.setflags(write=False)
+                prefixes[base][measure] = prefix
+        self._prefix = MappingProxyType({base: MappingProxyType(cubes) for base, cubes in prefixes.items()})
+
+    # ── Public helpers ─────────────────────────────────────────────────────────
+
+    def total(self, measure="revenue", start=None, end=None, by=None, **filters):
+        """
+        Exact total of a measure between two dates (inclusive), in O(1) per group.
+        Returns a float, or a DataFrame with one row per `by` group; NaN when the
+        range covers no loaded year.
+        """
+        lo, hi = self._day_bounds(start, end)
+        by, groups, values = self._window_sums(measure, "D", by, filters, np.array([lo]), np.array([hi]))
+        if self._loaded_days[hi] == self._loaded_days[lo]:
+            values = np.full_like(values, np.nan)  # range lies entirely in years not loaded
+        if not by:
+            return round(float(values[0, 0]), 2)
+        frame = pd.DataFrame(groups, columns=by)
+        frame[measure] = values[:, 0]
+        return frame.round(2).sort_values(measure, ascending=False).reset_index(drop=True)
+
+    def series(self, measure="revenue", freq="M", start=None, end=None, by=None, **filters) -> pd.DataFrame:
+        """Dense per-period totals (no missing periods) for periods overlapping start..end."""
+        periods, edges, selected = self._grid(freq, start, end)
+        by, groups, values = self._window_sums(
+            measure, self._base(freq), by, filters, edges[selected], edges[selected + 1]
+        )
+        return self._frame(by, groups, periods[selected], {measure: values})
+
+    def running_total(self, measure="revenue", freq="M", start=None, end=None, by=None, **filters) -> pd.DataFrame:
+        """Per-period totals plus the cumulative total since the first selected period."""
+        periods, edges, selected = self._grid(freq, start, end)
+        base = self._base(freq)
+        lo, hi = edges[selected], edges[selected + 1]
+        by, groups, values = self._window_sums(measure, base, by, filters, lo, hi)
+        origin = np.full_like(hi, lo[0] if len(lo) else 0)
+        _, _, running = self._window_sums(measure, base, by, filters, origin, hi)
+        return self._frame(by, groups, periods[selected], {measure: values, f"running_{measure}": running})
+
+    def rolling(
+        self, measure="revenue", window=7, freq="D", how="sum", start=None, end=None, by=None, **filters
+    ) -> pd.DataFrame:
+        """
+        Trailing `window`-period sum (or mean) ending at each selected period.
+        Windows may reach back before `start`, skip filtered-out years, and are
+        shortened rather than left empty at the start of the data. profit_margin
+        is always a ratio of sums.
+        """
+        if how not in ("sum", "mean"):
+            raise ValueError(f"how must be 'sum' or 'mean', got {how!r}")
+        if window < 1:
+            raise ValueError(f"window must be at least 1, got {window}")
+        periods, edges, selected = self._grid(freq, start, end)
+        base = self._base(freq)
+        # Windows count loaded periods only; periods of filtered-out years hold zeros
+        # in the prefix sums, so spanning them does not change the window total.
+        loaded = self._loaded(periods)
+        rank = np.searchsorted(loaded, selected)
+        first = np.maximum(rank + 1 - window, 0)
+        by, groups, values = self._window_sums(measure, base, by, filters, edges[selected], edges[selected + 1])
+        _, _, rolled = self._window_sums(measure, base, by, filters, edges[loaded[first]], edges[selected + 1])
+        if how == "mean" and measure != "profit_margin":
+            rolled = rolled / (rank + 1 - first)
+        return self._frame(by, groups, periods[selected], {measure: values, f"rolling_{measure}": rolled})
+
+    def period_over_period(
+        self, measure="revenue", freq="Y", lag=1, start=None, end=None, by=None, **filters
+    ) -> pd.DataFrame:
+        """
+        Each period against the period `lag` steps earlier: YoY with freq="Y",
+        QoQ with freq="Q", or same quarter last year with freq="Q", lag=4.
+        The prior is NaN when that period falls before the data or in a year
+        that is not loaded. pct_change is in percent.
+        """
+        if lag < 1:
+            raise ValueError(f"lag must be at least 1, got {lag}")
+        periods, edges, selected = self._grid(freq, start, end)
+        base = self._base(freq)
+        by, groups, values = self._window_sums(measure, base, by, filters, edges[selected], edges[selected + 1])
+        prior_idx = np.maximum(selected - lag, 0)
+        _, _, prior = self._window_sums(measure, base, by, filters, edges[prior_idx], edges[prior_idx + 1])
+        prior[:, (selected < lag) | ~np.isin(selected - lag, self._loaded(periods))] = np.nan
+        change = values - prior
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(prior != 0, change / np.abs(prior) * 100, np.nan)
+        return self._frame(
+            by,
+            groups,
+            periods[selected],
+            {measure: values, f"prior_{measure}": prior, "change": change, "pct_change": pct},
+        )
+
+    # ── Internals ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _base(freq: str) -> str:
+        if freq not in FREQUENCIES:
+            raise ValueError(f"freq must be one of {FREQUENCIES}, got {freq!r}")
+        return "D" if freq == "D" else "M"
+
+    def _grid(self, freq, start, end):
+        """Return (periods, prefix edges, indices of loaded periods overlapping start..end)."""
+        if self._base(freq) == "D":
+            periods, edges = self.days, np.arange(len(self.days) + 1)
+        elif freq == "M":
+            periods, edges = self.months, np.arange(len(self.months) + 1)
+        else:
+            keys = self.months.asfreq(freq)
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.array([], dtype=int)
+            periods, edges = keys[starts], np.r_[starts, len(self.months)]
+        mask = np.isin(periods.year, self.years)
+        if start is not None:
+            mask &= periods.end_time >= _to_period(start).start_time
+        if end is not None:
+            mask &= periods.start_time <= _to_period(end).end_time
+        return periods, edges, np.flatnonzero(mask)
+
+    def _loaded(self, periods) -> np.ndarray:
+        """Indices of the periods that fall in a loaded year."""
+        return np.flatnonzero(np.isin(periods.year, self.years))
+
+    def _day_bounds(self, start, end):
+        lo, hi = 0, len(self.days)
+        if len(self.days) == 0:
+            return lo, hi
+        starts = self.days.start_time
+        if start is not None:
+            lo = int(starts.searchsorted(_to_period(start).start_time, side="left"))
+        if end is not None:
+            hi = int(starts.searchsorted(_to_period(end).end_time, side="right"))
+        return lo, max(lo, hi)
+
+    def _window_sums(self, measure, base, by, filters, lo, hi):
+        """Sum `measure` over prefix positions lo..hi for every `by` group -> (by, groups, G × P array)."""
+        if measure not in MEASURES:
+            raise ValueError(f"measure must be one of {MEASURES}, got {measure!r}")
+        if measure == "profit_margin":
+            by, groups, profit = self._window_sums("profit", base, by, filters, lo, hi)
+            _, _, revenue = self._window_sums("revenue", base, by, filters, lo, hi)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return by, groups, np.where(revenue != 0, profit / revenue * 100, np.nan)
+        by, groups, prefix = self._select(self._prefix[base][measure], by, filters)
+        return by, groups, prefix[:, hi] - prefix[:, lo]
+
+    def _select(self, cube, by, filters):
+        """Apply dimension filters and collapse every dimension not in `by` -> (by, groups, G × T array)."""
+        by = [by] if isinstance(by, str) else list(by or [])
+        unknown = sorted((set(by) | set(filters)) - set(DIMENSIONS))
+        if unknown:
+            raise ValueError(f"Unknown dimension(s) {unknown}; time-series dimensions are {DIMENSIONS}")
+
+        kept = {}
+        for axis, dim in enumerate(DIMENSIONS):
+            members = self.members[dim]
+            if dim in filters:
+                wanted = filters[dim]
+                wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+                missing = [value for value in wanted if value not in members]
+                if missing:
+                    raise ValueError(
+                        f"{dim} value(s) {missing} are not in the data (unknown or removed by the "
+                        f"sidebar filters); available: {list(members)}"
+                    )
+                idx = [i for i, member in enumerate(members) if member in wanted]
+                cube = np.take(cube, idx, axis=axis)
+                members = [members[i] for i in idx]
+            if dim in by:
+                kept[dim] = members
+            else:
+                cube = cube.sum(axis=axis, keepdims=True)
+
+        cube = cube.reshape([len(kept[dim]) for dim in DIMENSIONS if dim in kept] + [cube.shape[-1]])
+        order = [dim for dim in DIMENSIONS if dim in kept]
+        cube = np.transpose(cube, [order.index(dim) for dim in by] + [len(by)])
+        groups = list(itertools.product(*(kept[dim] for dim in by)))
+        return by, groups, cube.reshape(len(groups), cube.shape[-1])
+
+    @staticmethod
+    def _frame(by, groups, periods, columns: dict) -> pd.DataFrame:
+        """Long-format result: period, by dimensions, then one column per G × P array."""
+        labels = periods.astype(str).to_numpy()
+        frame = pd.DataFrame({"period": np.tile(labels, len(groups))})
+        for i, dim in enumerate(by):
+            frame[dim] = np.repeat([group[i] for group in groups], len(labels))
+        for name, values in columns.items():
+            frame[name] = np.asarray(values, dtype=float).reshape(-1)
+        return frame.round(2).sort_values(["period", *by], kind="stable").reset_index(drop=True)